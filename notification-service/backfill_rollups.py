@@ -0,0 +1,25 @@
+"""Rebuild notification_rollups from the notifications collection.
+
+Run after deploying rollups; buckets from the current hour on are left to
+the live consumer (see backfill_from_notifications):
+
+    python backfill_rollups.py
+"""
+import logging
+
+from config import settings
+from db import MongoDBClient, NotificationRollupRepository
+
+logging.basicConfig(
+    level=settings.log_level,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+
+if __name__ == "__main__":
+    MongoDBClient.connect()
+    try:
+        # $merge matches on the unique bucket index
+        NotificationRollupRepository.ensure_indexes()
+        NotificationRollupRepository.backfill_from_notifications()
+    finally:
+        MongoDBClient.disconnect()
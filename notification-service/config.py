@@ -1,30 +1,41 @@
-import os
+from pydantic import Field
 from pydantic_settings import BaseSettings
 
 class Settings(BaseSettings):
+    # Values are read from the environment (or .env) when Settings() is
+    # instantiated; field names map to upper-case variables, e.g. RABBITMQ_HOST
+
     # RabbitMQ Configuration
-    rabbitmq_host: str = os.getenv("RABBITMQ_HOST", "localhost")
-    rabbitmq_port: int = int(os.getenv("RABBITMQ_PORT", 5672))
-    rabbitmq_user: str = os.getenv("RABBITMQ_USER", "guest")
-    rabbitmq_password: str = os.getenv("RABBITMQ_PASSWORD", "guest")
-    rabbitmq_vhost: str = os.getenv("RABBITMQ_VHOST", "/")
-    
+    rabbitmq_host: str = "localhost"
+    rabbitmq_port: int = 5672
+    rabbitmq_user: str = "guest"
+    rabbitmq_password: str = "guest"
+    rabbitmq_vhost: str = "/"
+
     # Service Configuration
-    service_port: int = int(os.getenv("NOTIFICATION_SERVICE_PORT", 8000))
-    service_host: str = os.getenv("NOTIFICATION_SERVICE_HOST", "0.0.0.0")
-    log_level: str = os.getenv("LOG_LEVEL", "INFO")
-    
+    service_port: int = Field(8000, validation_alias="NOTIFICATION_SERVICE_PORT")
+    service_host: str = Field("0.0.0.0", validation_alias="NOTIFICATION_SERVICE_HOST")
+    log_level: str = "INFO"
+
     # MongoDB Configuration
-    mongodb_uri: str = os.getenv("MONGODB_URI", "mongodb://localhost:27017")
-    mongodb_db: str = os.getenv("MONGODB_DB", "notifications")
-    
+    mongodb_uri: str = "mongodb://localhost:27017"
+    mongodb_db: str = "notifications"
+
+    # Rollup Configuration
+    rollup_minute_retention_days: int = 7
+    rollup_max_buckets: int = 5000
+
+    # Startup Configuration
+    startup_retry_initial_delay: float = 0.5
+    startup_retry_max_delay: float = 10.0
+
     # Environment
-    environment: str = os.getenv("ENVIRONMENT", "development")
-    
+    environment: str = "development"
+
     @property
     def rabbitmq_url(self) -> str:
         return f"amqp://{self.rabbitmq_user}:{self.rabbitmq_password}@{self.rabbitmq_host}:{self.rabbitmq_port}{self.rabbitmq_vhost}"
-    
+
     class Config:
         env_file = ".env"
 
@@ -1,14 +1,18 @@
+import base64
+import json
 import logging
-from typing import List, Optional
-from datetime import datetime
-import uuid
-from pymongo import MongoClient
+from typing import List, Optional, Tuple
+from datetime import datetime, timedelta
+from pymongo import ASCENDING, DESCENDING, TEXT, MongoClient, UpdateOne
 from pymongo.errors import ConnectionFailure
 from config import settings
-from models import Notification, EventType
+from models import Notification, Granularity
 
 logger = logging.getLogger(__name__)
 
+class MongoDBNotConnectedError(ConnectionFailure):
+    """Raised when the database is used before startup has connected"""
+
 class MongoDBClient:
     _client = None
     _db = None
@@ -16,6 +20,8 @@ class MongoDBClient:
     @classmethod
     def connect(cls):
         """Connect to MongoDB"""
+        # Never leave a previous client (and its monitor threads) behind
+        cls.disconnect()
         try:
             cls._client = MongoClient(
                 settings.mongodb_uri,
@@ -27,8 +33,13 @@ class MongoDBClient:
             cls._db = cls._client[settings.mongodb_db]
             logger.info(f"✓ Connected to MongoDB: {settings.mongodb_uri}")
             return cls._db
-        except ConnectionFailure as e:
+        except Exception as e:
             logger.error(f"✗ Failed to connect to MongoDB: {e}")
+            # Drop the half-open client so a retry starts clean
+            if cls._client:
+                cls._client.close()
+            cls._client = None
+            cls._db = None
             raise
     
     @classmethod
@@ -36,13 +47,24 @@ class MongoDBClient:
         """Disconnect from MongoDB"""
         if cls._client:
             cls._client.close()
+            cls._client = None
+            cls._db = None
             logger.info("✓ Disconnected from MongoDB")
     
+    @classmethod
+    def is_connected(cls) -> bool:
+        return cls._db is not None
+    
+    @classmethod
+    def is_reachable(cls) -> bool:
+        """Whether the driver currently sees a writable server; no I/O"""
+        return cls._client is not None and cls._client.topology_description.has_writable_server()
+    
     @classmethod
     def get_db(cls):
-        """Get MongoDB database"""
+        """Get MongoDB database; connecting is left to startup"""
         if cls._db is None:
-            cls.connect()
+            raise MongoDBNotConnectedError("MongoDB is not connected yet")
         return cls._db
 
 class NotificationRepository:
@@ -50,15 +72,59 @@ class NotificationRepository:
     
     COLLECTION_NAME = "notifications"
     
+    # Fields returned by list and search endpoints
+    PROJECTION = {
+        "event_type": 1,
+        "title": 1,
+        "message": 1,
+        "task_id": 1,
+        "read": 1,
+        "created_at": 1
+    }
+    
+    # Newest first; _id breaks ties between equal timestamps for keyset paging
+    SORT = [("created_at", DESCENDING), ("_id", DESCENDING)]
+    
     @classmethod
     def _get_collection(cls):
         db = MongoDBClient.get_db()
-        collection = db[cls.COLLECTION_NAME]
-        # Create indexes
+        return db[cls.COLLECTION_NAME]
+    
+    @classmethod
+    def ensure_indexes(cls):
+        """Create indexes backing lookups, filters and search"""
+        collection = cls._get_collection()
         collection.create_index("task_id")
-        collection.create_index("created_at")
-        collection.create_index([("created_at", -1)])
-        return collection
+        collection.create_index(cls.SORT)
+        # Equality filters first, then the sort keys
+        collection.create_index([("event_type", ASCENDING)] + cls.SORT)
+        collection.create_index([("read", ASCENDING)] + cls.SORT)
+        collection.create_index([("event_type", ASCENDING), ("read", ASCENDING)] + cls.SORT)
+        collection.create_index(
+            [("title", TEXT), ("message", TEXT)],
+            name="title_message_text"
+        )
+        logger.info(f"✓ Indexes ensured on '{cls.COLLECTION_NAME}'")
+    
+    @staticmethod
+    def encode_cursor(notification: dict) -> str:
+        """Opaque keyset cursor pointing after the given notification"""
+        key = json.dumps([notification["created_at"], str(notification["_id"])])
+        return base64.urlsafe_b64encode(key.encode()).decode()
+    
+    @staticmethod
+    def decode_cursor(cursor: str) -> Tuple[str, str]:
+        """Inverse of encode_cursor; raises ValueError on malformed input"""
+        try:
+            key = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        except Exception as e:
+            raise ValueError(f"Invalid cursor: {cursor}") from e
+        # Both values go straight into the query; reject anything but plain
+        # strings so a crafted cursor cannot smuggle in operators
+        if not (isinstance(key, list) and len(key) == 2 and all(isinstance(v, str) for v in key)):
+            raise ValueError(f"Invalid cursor: {cursor}")
+        created_at, notification_id = key
+        return created_at, notification_id
     
     @classmethod
     def save_notification(cls, notification: Notification) -> str:
@@ -78,8 +144,8 @@ class NotificationRepository:
         try:
             collection = cls._get_collection()
             notifications = list(collection
-                .find()
-                .sort("created_at", -1)
+                .find({}, cls.PROJECTION)
+                .sort(cls.SORT)
                 .skip(skip)
                 .limit(limit))
             
@@ -111,6 +177,57 @@ class NotificationRepository:
             logger.error(f"✗ Failed to get task notifications: {e}")
             return []
     
+    @classmethod
+    def build_search_query(cls, text: Optional[str] = None, event_type: Optional[str] = None,
+                           read: Optional[bool] = None, since: Optional[datetime] = None,
+                           until: Optional[datetime] = None, after: Optional[str] = None) -> dict:
+        """Filter used by search_notifications; raises ValueError on a bad cursor"""
+        clauses = []
+        if text:
+            clauses.append({"$text": {"$search": text}})
+        if event_type:
+            clauses.append({"event_type": event_type})
+        if read is not None:
+            clauses.append({"read": read})
+        if since or until:
+            created_at = {}
+            if since:
+                created_at["$gte"] = since.isoformat()
+            if until:
+                created_at["$lt"] = until.isoformat()
+            clauses.append({"created_at": created_at})
+        if after:
+            after_created_at, after_id = cls.decode_cursor(after)
+            clauses.append({"$or": [
+                {"created_at": {"$lt": after_created_at}},
+                {"created_at": after_created_at, "_id": {"$lt": after_id}}
+            ]})
+        return {"$and": clauses} if clauses else {}
+    
+    @classmethod
+    def search_notifications(cls, text: Optional[str] = None, event_type: Optional[str] = None,
+                             read: Optional[bool] = None, since: Optional[datetime] = None,
+                             until: Optional[datetime] = None, after: Optional[str] = None,
+                             limit: int = 20) -> List[dict]:
+        """Search notifications newest first, paging by keyset cursor"""
+        # A malformed cursor raises ValueError here, before touching the database
+        query = cls.build_search_query(text, event_type, read, since, until, after)
+        try:
+            collection = cls._get_collection()
+            notifications = list(collection
+                .find(query, cls.PROJECTION)
+                .sort(cls.SORT)
+                .limit(limit))
+            
+            for notif in notifications:
+                if "_id" in notif:
+                    notif["_id"] = str(notif["_id"])
+            
+            return notifications
+        except Exception as e:
+            logger.error(f"✗ Failed to search notifications: {e}")
+            raise
+    
     @classmethod
     def mark_as_read(cls, notification_id: str) -> bool:
         """Mark notification as read"""
@@ -176,3 +293,161 @@ class NotificationRepository:
         except Exception as e:
             logger.error(f"✗ Failed to clear old notifications: {e}")
             return 0
+
+
+class NotificationRollupRepository:
+    """Time-bucketed notification counts per event type"""
+    
+    COLLECTION_NAME = "notification_rollups"
+    
+    @classmethod
+    def _get_collection(cls):
+        db = MongoDBClient.get_db()
+        return db[cls.COLLECTION_NAME]
+    
+    @classmethod
+    def ensure_indexes(cls):
+        """Create bucket lookup and retention indexes"""
+        collection = cls._get_collection()
+        collection.create_index(
+            [("granularity", 1), ("event_type", 1), ("bucket", 1)],
+            unique=True
+        )
+        collection.create_index([("granularity", 1), ("bucket", 1)])
+        collection.create_index("expires_at", expireAfterSeconds=0)
+        logger.info(f"✓ Indexes ensured on '{cls.COLLECTION_NAME}'")
+    
+    @staticmethod
+    def _truncate(timestamp: datetime, granularity: Granularity) -> datetime:
+        if granularity == Granularity.HOUR:
+            return timestamp.replace(minute=0, second=0, microsecond=0)
+        return timestamp.replace(second=0, microsecond=0)
+    
+    @classmethod
+    def record_notification(cls, notification: Notification):
+        """Increment the minute and hour buckets for a notification"""
+        try:
+            collection = cls._get_collection()
+            created_at = datetime.fromisoformat(notification.created_at)
+            event_type = getattr(notification.event_type, "value", notification.event_type)
+            
+            operations = []
+            for granularity in Granularity:
+                bucket = cls._truncate(created_at, granularity)
+                update = {
+                    "$inc": {"count": 1},
+                    "$setOnInsert": {
+                        "granularity": granularity.value,
+                        "event_type": event_type,
+                        "bucket": bucket
+                    }
+                }
+                # Minute buckets are only useful for recent charts; let the
+                # TTL index drop them once they fall out of the retention window
+                if granularity == Granularity.MINUTE:
+                    update["$setOnInsert"]["expires_at"] = bucket + timedelta(
+                        days=settings.rollup_minute_retention_days
+                    )
+                operations.append(UpdateOne(
+                    {
+                        "granularity": granularity.value,
+                        "event_type": event_type,
+                        "bucket": bucket
+                    },
+                    update,
+                    upsert=True
+                ))
+            
+            collection.bulk_write(operations, ordered=False)
+        except Exception as e:
+            logger.error(f"✗ Failed to update notification rollups: {e}")
+            raise
+
+    @classmethod
+    def backfill_from_notifications(cls):
+        """Rebuild buckets from existing notifications
+
+        Counts are recomputed from the notifications collection and replace
+        matching buckets. Only buckets that end before the start of the
+        current hour are rebuilt; the hour in progress is left to the live
+        consumer's $inc so concurrent events are not overwritten. Minute
+        buckets are only rebuilt for the retention window.
+        """
+        try:
+            notifications = MongoDBClient.get_db()[NotificationRepository.COLLECTION_NAME]
+            now = datetime.utcnow()
+            cutoff = cls._truncate(now, Granularity.HOUR)
+            minute_start = cls._truncate(
+                now - timedelta(days=settings.rollup_minute_retention_days), Granularity.MINUTE
+            )
+
+            for granularity in Granularity:
+                created_at = {"$lt": cutoff.isoformat()}
+                if granularity == Granularity.MINUTE:
+                    created_at["$gte"] = minute_start.isoformat()
+                pipeline = [
+                    {"$match": {"created_at": created_at}},
+                    # created_at is an ISO string; parse up to whole seconds
+                    {"$project": {
+                        "event_type": 1,
+                        "created_at": {"$dateFromString": {
+                            "dateString": {"$substrCP": ["$created_at", 0, 19]},
+                            "format": "%Y-%m-%dT%H:%M:%S",
+                            "onError": None,
+                            "onNull": None
+                        }}
+                    }},
+                    {"$match": {"created_at": {"$ne": None}}},
+                    {"$group": {
+                        "_id": {
+                            "event_type": "$event_type",
+                            "bucket": {"$dateTrunc": {"date": "$created_at", "unit": granularity.value}}
+                        },
+                        "count": {"$sum": 1}
+                    }},
+                    {"$project": {
+                        "_id": 0,
+                        "granularity": granularity.value,
+                        "event_type": "$_id.event_type",
+                        "bucket": "$_id.bucket",
+                        "count": 1
+                    }}
+                ]
+                if granularity == Granularity.MINUTE:
+                    pipeline.append({"$set": {"expires_at": {"$dateAdd": {
+                        "startDate": "$bucket",
+                        "unit": "day",
+                        "amount": settings.rollup_minute_retention_days
+                    }}}})
+                pipeline.append({"$merge": {
+                    "into": cls.COLLECTION_NAME,
+                    "on": ["granularity", "event_type", "bucket"],
+                    "whenMatched": "replace",
+                    "whenNotMatched": "insert"
+                }})
+
+                notifications.aggregate(pipeline)
+                logger.info(f"✓ Backfilled {granularity.value} rollups from '{NotificationRepository.COLLECTION_NAME}'")
+        except Exception as e:
+            logger.error(f"✗ Failed to backfill notification rollups: {e}")
+            raise
+
+    @classmethod
+    def get_timeseries(cls, granularity: Granularity, start: datetime, end: datetime,
+                       event_type: Optional[str] = None) -> List[dict]:
+        """Get bucket counts in [start, end) ordered by bucket"""
+        try:
+            collection = cls._get_collection()
+            query = {
+                "granularity": granularity.value,
+                "bucket": {"$gte": cls._truncate(start, granularity), "$lt": end}
+            }
+            if event_type:
+                query["event_type"] = event_type
+            
+            return list(collection
+                .find(query, {"_id": 0, "event_type": 1, "bucket": 1, "count": 1})
+                .sort("bucket", 1))
+        except Exception as e:
+            logger.error(f"✗ Failed to get notification timeseries: {e}")
+            raise
@@ -2,19 +2,20 @@ import asyncio
 import logging
 import uuid
 import os
-from fastapi import FastAPI, HTTPException, Query
+from fastapi import Depends, FastAPI, HTTPException, Query
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
-from fastapi.responses import FileResponse
+from fastapi.responses import FileResponse, JSONResponse
 from pydantic import BaseModel
-from typing import List, Optional
+from typing import Dict, List, Optional
 from contextlib import asynccontextmanager
-from datetime import datetime
+from datetime import datetime, timedelta, timezone
 
 from config import settings
-from models import TaskEvent, EventType, Notification, NotificationTemplate
-from rabbitmq_client import RabbitMQConnection, RabbitMQProducer, RabbitMQConsumer
-from db import MongoDBClient, NotificationRepository
+from models import TaskEvent, Granularity, Notification, NotificationTemplate
+from rabbitmq_client import RabbitMQConnection, RabbitMQTopology, RabbitMQConsumer
+from db import MongoDBClient, NotificationRepository, NotificationRollupRepository
+from startup import StartupManager
 
 # Setup logging
 logging.basicConfig(
@@ -37,12 +38,27 @@ class NotificationResponse(BaseModel):
     class Config:
         populate_by_name = True  # Allow both 'id' and '_id'
 
+class NotificationSearchResponse(BaseModel):
+    items: List[NotificationResponse]
+    next_cursor: Optional[str] = None
+
 class NotificationStats(BaseModel):
     total: int
     unread: int
     by_type: dict
 
-# Background task for consuming messages
+class TimeseriesPoint(BaseModel):
+    bucket: datetime
+    count: int
+
+class NotificationTimeseries(BaseModel):
+    granularity: Granularity
+    start: datetime
+    end: datetime
+    series: Dict[str, List[TimeseriesPoint]]
+
+# Background tasks for connecting dependencies and consuming messages
+startup_task = None
 async_task = None
 
 async def process_event(event: TaskEvent):
@@ -62,55 +78,79 @@ async def process_event(event: TaskEvent):
         
         # Save to database
         NotificationRepository.save_notification(notification)
+        NotificationRollupRepository.record_notification(notification)
         logger.info(f"📬 Notification created for event: {event.event_type}")
         
     except Exception as e:
         logger.error(f"✗ Error processing event: {e}")
 
 async def start_consumer():
-    """Start message consumer"""
+    """Start message consumer; the service is ready once it is attached"""
     try:
-        await RabbitMQConsumer.start_consuming(process_event)
+        await RabbitMQConsumer.start_consuming(process_event, on_started=StartupManager.mark_ready)
     except Exception as e:
         logger.error(f"✗ Consumer error: {e}")
         # Retry after 5 seconds
         await asyncio.sleep(5)
         await start_consumer()
 
+async def connect_rabbitmq():
+    """Connect to RabbitMQ and declare topology once"""
+    await RabbitMQConnection.get_channel()
+    await RabbitMQTopology.declare()
+
+async def connect_mongodb():
+    """Connect to MongoDB without blocking the event loop"""
+    await asyncio.to_thread(MongoDBClient.connect)
+
+def _ensure_indexes_sync():
+    NotificationRepository.ensure_indexes()
+    NotificationRollupRepository.ensure_indexes()
+
+async def ensure_indexes():
+    """Create MongoDB indexes once the connection is up"""
+    await asyncio.to_thread(_ensure_indexes_sync)
+
+async def setup_mongodb():
+    """Connect with retry, then create indexes"""
+    await StartupManager.connect_with_retry("mongodb", connect_mongodb)
+    # Index problems (e.g. a conflicting text index) are not connectivity
+    # problems: retry them on the existing client, reported under their own
+    # name, and stay not-ready until search and rollups have their indexes
+    await StartupManager.run_step("mongodb_indexes", ensure_indexes)
+
+async def connect_dependencies():
+    """Connect to RabbitMQ and MongoDB concurrently, then start consuming"""
+    await asyncio.gather(
+        StartupManager.connect_with_retry("rabbitmq", connect_rabbitmq),
+        setup_mongodb()
+    )
+    
+    global async_task
+    async_task = asyncio.create_task(start_consumer())
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Manage application lifecycle"""
-    # Startup
+    # Startup: serve /health immediately and connect in the background
     logger.info("🚀 Starting Notification Service...")
+    StartupManager.begin()
     
-    try:
-        # Connect to RabbitMQ
-        await RabbitMQConnection.connect()
-        await RabbitMQProducer.initialize()
-        
-        # Connect to MongoDB
-        MongoDBClient.connect()
-        
-        # Start consumer in background
-        global async_task
-        async_task = asyncio.create_task(start_consumer())
-        
-        logger.info("✓ Notification Service started successfully")
-    except Exception as e:
-        logger.error(f"✗ Startup failed: {e}")
-        raise
+    global startup_task
+    startup_task = asyncio.create_task(connect_dependencies())
     
     yield
     
     # Shutdown
     logger.info("🛑 Shutting down Notification Service...")
     
-    if async_task:
-        async_task.cancel()
-        try:
-            await async_task
-        except asyncio.CancelledError:
-            pass
+    for task in (startup_task, async_task):
+        if task:
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
     
     await RabbitMQConnection.disconnect()
     MongoDBClient.disconnect()
@@ -140,6 +180,18 @@ if os.path.exists(static_dir):
 
 # Routes
 
+def require_mongodb():
+    """Reject data requests with 503 until the background connect finishes"""
+    if not MongoDBClient.is_connected():
+        raise HTTPException(status_code=503, detail="MongoDB is not connected yet")
+
+def _to_naive_utc(value: datetime) -> datetime:
+    # Timestamps are stored as naive UTC, matching datetime.utcnow()
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
+
 @app.get("/", tags=["UI"])
 async def root():
     """Serve the notification dashboard UI"""
@@ -159,25 +211,17 @@ async def health_check():
 
 @app.get("/readiness", tags=["Health"])
 async def readiness_check():
-    """Readiness check endpoint"""
-    try:
-        # Check RabbitMQ
-        channel = await RabbitMQConnection.get_channel()
-        # Check MongoDB
-        MongoDBClient.get_db()
-        
-        return {
-            "status": "ready",
-            "services": {
-                "rabbitmq": "connected",
-                "mongodb": "connected"
-            }
-        }
-    except Exception as e:
-        logger.error(f"✗ Readiness check failed: {e}")
-        return {"status": "not_ready", "error": str(e)}, 503
+    """Readiness check endpoint reporting startup progress and live dependency state"""
+    report = StartupManager.report({
+        "rabbitmq": RabbitMQConnection.is_connected(),
+        "consumer": RabbitMQConsumer.is_consuming(),
+        "mongodb": MongoDBClient.is_reachable()
+    })
+    if report["status"] != "ready":
+        return JSONResponse(status_code=503, content=report)
+    return report
 
-@app.get("/notifications", response_model=List[NotificationResponse], tags=["Notifications"])
+@app.get("/notifications", response_model=List[NotificationResponse], dependencies=[Depends(require_mongodb)], tags=["Notifications"])
 async def get_notifications(
     limit: int = Query(50, ge=1, le=100),
     skip: int = Query(0, ge=0)
@@ -193,7 +237,45 @@ async def get_notifications(
         logger.error(f"✗ Error getting notifications: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
-@app.get("/notifications/task/{task_id}", response_model=List[NotificationResponse], tags=["Notifications"])
+@app.get("/notifications/search", response_model=NotificationSearchResponse, dependencies=[Depends(require_mongodb)], tags=["Notifications"])
+async def search_notifications(
+    q: Optional[str] = Query(None, min_length=1, description="Full-text search over title and message"),
+    event_type: Optional[str] = Query(None),
+    read: Optional[bool] = Query(None),
+    since: Optional[datetime] = Query(None, description="Created at or after (UTC)"),
+    until: Optional[datetime] = Query(None, description="Created before (UTC)"),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
+    limit: int = Query(20, ge=1, le=100)
+):
+    """Search notifications by text, event type, read state and date range"""
+    try:
+        notifications = NotificationRepository.search_notifications(
+            text=q,
+            event_type=event_type,
+            read=read,
+            since=_to_naive_utc(since) if since else None,
+            until=_to_naive_utc(until) if until else None,
+            after=cursor,
+            limit=limit
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        logger.error(f"✗ Error searching notifications: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+    
+    next_cursor = None
+    if len(notifications) == limit:
+        next_cursor = NotificationRepository.encode_cursor(notifications[-1])
+    for notif in notifications:
+        if "_id" in notif and "id" not in notif:
+            notif["id"] = notif["_id"]
+    return NotificationSearchResponse(
+        items=[NotificationResponse(**n) for n in notifications],
+        next_cursor=next_cursor
+    )
+
+@app.get("/notifications/task/{task_id}", response_model=List[NotificationResponse], dependencies=[Depends(require_mongodb)], tags=["Notifications"])
 async def get_task_notifications(task_id: str):
     """Get notifications for specific task"""
     try:
@@ -206,7 +288,7 @@ async def get_task_notifications(task_id: str):
         logger.error(f"✗ Error getting task notifications: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
-@app.post("/notifications/{notification_id}/read", tags=["Notifications"])
+@app.post("/notifications/{notification_id}/read", dependencies=[Depends(require_mongodb)], tags=["Notifications"])
 async def mark_notification_read(notification_id: str):
     """Mark notification as read"""
     try:
@@ -218,7 +300,7 @@ async def mark_notification_read(notification_id: str):
         logger.error(f"✗ Error marking notification as read: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
-@app.post("/notifications/read-all", tags=["Notifications"])
+@app.post("/notifications/read-all", dependencies=[Depends(require_mongodb)], tags=["Notifications"])
 async def mark_all_notifications_read():
     """Mark all notifications as read"""
     try:
@@ -231,7 +313,7 @@ async def mark_all_notifications_read():
         logger.error(f"✗ Error marking all as read: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
-@app.delete("/notifications/{notification_id}", tags=["Notifications"])
+@app.delete("/notifications/{notification_id}", dependencies=[Depends(require_mongodb)], tags=["Notifications"])
 async def delete_notification(notification_id: str):
     """Delete notification"""
     try:
@@ -243,7 +325,7 @@ async def delete_notification(notification_id: str):
         logger.error(f"✗ Error deleting notification: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
-@app.get("/stats", response_model=NotificationStats, tags=["Stats"])
+@app.get("/stats", response_model=NotificationStats, dependencies=[Depends(require_mongodb)], tags=["Stats"])
 async def get_notification_stats():
     """Get notification statistics"""
     try:
@@ -264,6 +346,49 @@ async def get_notification_stats():
         logger.error(f"✗ Error getting stats: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
+@app.get("/stats/timeseries", response_model=NotificationTimeseries, dependencies=[Depends(require_mongodb)], tags=["Stats"])
+async def get_notification_timeseries(
+    granularity: Granularity = Query(Granularity.HOUR),
+    start: Optional[datetime] = Query(None, description="Range start (UTC), defaults to 1 hour (minute) or 7 days (hour) before end"),
+    end: Optional[datetime] = Query(None, description="Range end (UTC, exclusive), defaults to now"),
+    event_type: Optional[str] = Query(None)
+):
+    """Get notification counts per event type bucketed by minute or hour"""
+    if granularity == Granularity.MINUTE:
+        bucket_size, default_range = timedelta(minutes=1), timedelta(hours=1)
+    else:
+        bucket_size, default_range = timedelta(hours=1), timedelta(days=7)
+    
+    end = _to_naive_utc(end) if end else datetime.utcnow()
+    start = _to_naive_utc(start) if start else end - default_range
+    if start >= end:
+        raise HTTPException(status_code=400, detail="start must be before end")
+    
+    if (end - start) / bucket_size > settings.rollup_max_buckets:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Range spans more than {settings.rollup_max_buckets} {granularity.value} buckets"
+        )
+    
+    try:
+        buckets = NotificationRollupRepository.get_timeseries(granularity, start, end, event_type)
+        
+        series = {}
+        for b in buckets:
+            series.setdefault(b["event_type"], []).append(
+                TimeseriesPoint(bucket=b["bucket"], count=b["count"])
+            )
+        
+        return NotificationTimeseries(
+            granularity=granularity,
+            start=start,
+            end=end,
+            series=series
+        )
+    except Exception as e:
+        logger.error(f"✗ Error getting timeseries: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(
@@ -11,6 +11,10 @@ class EventType(str, Enum):
     TASK_COMPLETED = "task.completed"
     TASK_DELETED = "task.deleted"
 
+class Granularity(str, Enum):
+    MINUTE = "minute"
+    HOUR = "hour"
+
 class TaskEvent:
     def __init__(self, event_type: EventType, task_id: str, description: str, 
                  is_completed: bool = False, timestamp: str = None):
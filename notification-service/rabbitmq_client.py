@@ -2,7 +2,7 @@ import logging
 from typing import Optional
 import aio_pika
 from config import settings
-from models import TaskEvent, EventType
+from models import TaskEvent
 
 logger = logging.getLogger(__name__)
 
@@ -25,10 +25,17 @@ class RabbitMQConnection:
     @classmethod
     async def disconnect(cls):
         """Close RabbitMQ connection"""
+        RabbitMQTopology.reset()
         if cls._connection:
             await cls._connection.close()
             logger.info("✓ Disconnected from RabbitMQ")
     
+    @classmethod
+    def is_connected(cls) -> bool:
+        """True while the connection is open; False when closed or reconnecting"""
+        conn = cls._connection
+        return conn is not None and not conn.is_closed and conn.transport is not None
+    
     @classmethod
     async def get_channel(cls) -> aio_pika.Channel:
         """Get RabbitMQ channel"""
@@ -36,17 +43,22 @@ class RabbitMQConnection:
             await cls.connect()
         return cls._channel
 
-class RabbitMQProducer:
-    """Publish events to RabbitMQ"""
+class RabbitMQTopology:
+    """Exchange, queue and bindings shared by producer and consumer"""
     
     EXCHANGE_NAME = "task_events"
-    EXCHANGE_TYPE = "topic"
     QUEUE_NAME = "notification_queue"
     BINDING_KEYS = ["task.*"]
     
+    _exchange: Optional[aio_pika.abc.AbstractExchange] = None
+    _queue: Optional[aio_pika.abc.AbstractQueue] = None
+    
     @classmethod
-    async def initialize(cls):
-        """Initialize exchange and queues"""
+    async def declare(cls):
+        """Declare exchange, queue and bindings once per connection"""
+        if cls._exchange is not None and cls._queue is not None:
+            return cls._queue, cls._exchange
+        
         channel = await RabbitMQConnection.get_channel()
         
         # Declare exchange
@@ -69,6 +81,25 @@ class RabbitMQProducer:
             await queue.bind(exchange, routing_key=binding_key)
             logger.info(f"✓ Queue bound to exchange with key: {binding_key}")
         
+        cls._exchange, cls._queue = exchange, queue
+        return queue, exchange
+    
+    @classmethod
+    def reset(cls):
+        """Forget declared objects so the next declare() runs again"""
+        cls._exchange = None
+        cls._queue = None
+
+class RabbitMQProducer:
+    """Publish events to RabbitMQ"""
+    
+    EXCHANGE_NAME = RabbitMQTopology.EXCHANGE_NAME
+    EXCHANGE_TYPE = "topic"
+    
+    @classmethod
+    async def initialize(cls):
+        """Initialize exchange and queues"""
+        _, exchange = await RabbitMQTopology.declare()
         return exchange
     
     @classmethod
@@ -94,43 +125,31 @@ class RabbitMQProducer:
 class RabbitMQConsumer:
     """Consume events from RabbitMQ"""
     
-    QUEUE_NAME = "notification_queue"
-    EXCHANGE_NAME = "task_events"
-    BINDING_KEYS = ["task.*"]
+    QUEUE_NAME = RabbitMQTopology.QUEUE_NAME
+    
+    _consuming: bool = False
+    
+    @classmethod
+    def is_consuming(cls) -> bool:
+        return cls._consuming
     
     @classmethod
     async def setup_queue(cls):
         """Setup consumer queue and bindings"""
-        channel = await RabbitMQConnection.get_channel()
-        
-        # Declare exchange
-        exchange = await channel.declare_exchange(
-            cls.EXCHANGE_NAME,
-            aio_pika.ExchangeType.TOPIC,
-            durable=True
-        )
-        
-        # Declare queue
-        queue = await channel.declare_queue(
-            cls.QUEUE_NAME,
-            durable=True
-        )
-        
-        # Bind queue to exchange
-        for binding_key in cls.BINDING_KEYS:
-            await queue.bind(exchange, routing_key=binding_key)
-            logger.info(f"✓ Queue bound to {cls.EXCHANGE_NAME} with key: {binding_key}")
-        
-        return queue, exchange
+        return await RabbitMQTopology.declare()
     
     @classmethod
-    async def start_consuming(cls, callback):
+    async def start_consuming(cls, callback, on_started=None):
         """Start consuming messages from queue"""
         try:
             queue, _ = await cls.setup_queue()
             
             async with queue.iterator() as queue_iter:
+                # Entering the iterator registers the consumer with the broker
+                cls._consuming = True
                 logger.info(f"✓ Started consuming from queue: {cls.QUEUE_NAME}")
+                if on_started:
+                    on_started()
                 async for message in queue_iter:
                     try:
                         async with message.process():
@@ -143,3 +162,5 @@ class RabbitMQConsumer:
         except Exception as e:
             logger.error(f"✗ Failed to consume messages: {e}")
             raise
+        finally:
+            cls._consuming = False
@@ -0,0 +1,123 @@
+import asyncio
+import logging
+import time
+from typing import Awaitable, Callable, Dict, Optional
+
+from config import settings
+
+logger = logging.getLogger(__name__)
+
+class DependencyStatus:
+    """Progress for a single dependency or startup step"""
+
+    PENDING = "pending"
+    CONNECTING = "connecting"
+    CONNECTED = "connected"
+    RUNNING = "running"
+    DONE = "done"
+    FAILED = "failed"
+
+    def __init__(self, name: str):
+        self.name = name
+        self.state = self.PENDING
+        self.attempts = 0
+        self.last_error: Optional[str] = None
+        self.ready_after: Optional[float] = None
+
+    def to_dict(self) -> dict:
+        return {
+            "state": self.state,
+            "attempts": self.attempts,
+            "last_error": self.last_error,
+            "ready_after_seconds": self.ready_after
+        }
+
+class StartupManager:
+    """Connect to dependencies in the background with retry"""
+
+    _started_at: Optional[float] = None
+    _ready_after: Optional[float] = None
+    _dependencies: Dict[str, DependencyStatus] = {}
+
+    @classmethod
+    def begin(cls):
+        """Mark the start of application startup"""
+        cls._started_at = time.monotonic()
+        cls._ready_after = None
+        cls._dependencies = {}
+
+    @classmethod
+    def elapsed(cls) -> float:
+        return round(time.monotonic() - cls._started_at, 3) if cls._started_at else 0.0
+
+    @classmethod
+    def is_ready(cls) -> bool:
+        return cls._ready_after is not None
+
+    @classmethod
+    def mark_ready(cls):
+        if cls._ready_after is not None:
+            return
+        cls._ready_after = cls.elapsed()
+        logger.info(f"✓ Notification Service ready in {cls._ready_after:.3f}s")
+
+    @classmethod
+    async def connect_with_retry(cls, name: str, connect: Callable[[], Awaitable]):
+        """Run connect until it succeeds, backing off between attempts"""
+        status = cls._dependencies.setdefault(name, DependencyStatus(name))
+        delay = settings.startup_retry_initial_delay
+
+        while True:
+            status.state = DependencyStatus.CONNECTING
+            status.attempts += 1
+            try:
+                await connect()
+                status.state = DependencyStatus.CONNECTED
+                status.last_error = None
+                status.ready_after = cls.elapsed()
+                logger.info(f"✓ {name} ready after {status.ready_after:.3f}s ({status.attempts} attempt(s))")
+                return
+            except Exception as e:
+                status.last_error = str(e)
+                logger.warning(f"⏳ {name} not available (attempt {status.attempts}): {e}; retrying in {delay:.1f}s")
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, settings.startup_retry_max_delay)
+
+    @classmethod
+    async def run_step(cls, name: str, step: Callable[[], Awaitable]):
+        """Run a startup step until it succeeds, reporting failures under its own name"""
+        status = cls._dependencies.setdefault(name, DependencyStatus(name))
+        delay = settings.startup_retry_initial_delay
+
+        while True:
+            status.state = DependencyStatus.RUNNING
+            status.attempts += 1
+            try:
+                await step()
+                status.state = DependencyStatus.DONE
+                status.last_error = None
+                status.ready_after = cls.elapsed()
+                logger.info(f"✓ {name} done after {status.ready_after:.3f}s")
+                return
+            except Exception as e:
+                status.state = DependencyStatus.FAILED
+                status.last_error = str(e)
+                logger.error(f"✗ {name} failed (attempt {status.attempts}): {e}; retrying in {delay:.1f}s")
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, settings.startup_retry_max_delay)
+
+    @classmethod
+    def report(cls, live: Dict[str, bool]) -> dict:
+        """Startup progress plus current dependency health for the readiness endpoint"""
+        settled = all(
+            dep.state in (DependencyStatus.CONNECTED, DependencyStatus.DONE)
+            for dep in cls._dependencies.values()
+        )
+        ready = cls.is_ready() and settled and all(live.values())
+        return {
+            "status": "ready" if ready else "not_ready",
+            "uptime_seconds": cls.elapsed(),
+            "ready_after_seconds": cls._ready_after,
+            "live": live,
+            "services": {name: dep.to_dict() for name, dep in cls._dependencies.items()}
+        }
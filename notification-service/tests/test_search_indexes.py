@@ -0,0 +1,87 @@
+import uuid
+from datetime import datetime, timedelta
+
+import pytest
+from pymongo import MongoClient
+from pymongo.errors import PyMongoError
+
+from config import settings
+from db import MongoDBClient, NotificationRepository
+from models import EventType, Notification
+
+@pytest.fixture(scope="module")
+def notifications():
+    """Seeded notifications collection in a throwaway database"""
+    client = MongoClient(settings.mongodb_uri, serverSelectionTimeoutMS=1000)
+    try:
+        client.admin.command("ping")
+    except PyMongoError as e:
+        client.close()
+        pytest.skip(f"MongoDB not reachable at {settings.mongodb_uri}: {e}")
+
+    db_name = f"{settings.mongodb_db}_test_{uuid.uuid4().hex[:8]}"
+    MongoDBClient._client = client
+    MongoDBClient._db = client[db_name]
+
+    NotificationRepository.ensure_indexes()
+    start = datetime(2026, 1, 1)
+    event_types = list(EventType)
+    for i in range(200):
+        NotificationRepository.save_notification(Notification(
+            notification_id=str(uuid.uuid4()),
+            event_type=event_types[i % len(event_types)].value,
+            title=f"Task {i}",
+            message=f"Task 'report {i}' has been updated",
+            task_id=f"task-{i % 20}",
+            read=i % 3 == 0,
+            created_at=(start + timedelta(minutes=i)).isoformat()
+        ))
+
+    yield NotificationRepository._get_collection()
+
+    client.drop_database(db_name)
+    MongoDBClient.disconnect()
+
+def _stages(plan):
+    """All stage names in an explain plan tree"""
+    if isinstance(plan, dict):
+        if "stage" in plan:
+            yield plan["stage"]
+        for value in plan.values():
+            yield from _stages(value)
+    elif isinstance(plan, list):
+        for value in plan:
+            yield from _stages(value)
+
+def _cursor_after(collection):
+    first = collection.find({}, NotificationRepository.PROJECTION).sort(NotificationRepository.SORT).limit(1)
+    return NotificationRepository.encode_cursor(next(first))
+
+SINCE = datetime(2026, 1, 1, 1)
+UNTIL = datetime(2026, 1, 1, 2)
+
+@pytest.mark.parametrize("params", [
+    {},
+    {"event_type": EventType.TASK_CREATED.value},
+    {"read": False},
+    {"event_type": EventType.TASK_UPDATED.value, "read": True},
+    {"since": SINCE, "until": UNTIL},
+    {"event_type": EventType.TASK_CREATED.value, "since": SINCE},
+    {"after": "cursor"},
+    {"read": False, "after": "cursor"},
+    {"text": "report"},
+    {"text": "report", "event_type": EventType.TASK_UPDATED.value, "read": False},
+], ids=lambda params: "+".join(params) or "no_filter")
+def test_search_queries_use_indexes(notifications, params):
+    if params.get("after") == "cursor":
+        params = {**params, "after": _cursor_after(notifications)}
+    query = NotificationRepository.build_search_query(**params)
+
+    explain = (notifications
+        .find(query, NotificationRepository.PROJECTION)
+        .sort(NotificationRepository.SORT)
+        .limit(20)
+        .explain())
+    stages = set(_stages(explain["queryPlanner"]["winningPlan"]))
+
+    assert "COLLSCAN" not in stages, f"{query} fell back to a collection scan: {stages}"